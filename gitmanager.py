@@ -1,10 +1,12 @@
 import argparse
 import sys
-from typing import Dict, List, Set, Tuple
+import types
+from typing import Callable, Dict, FrozenSet, List, Mapping, OrderedDict, Set, Tuple
+from collections import deque
 
 # --- Модель данных репозитория Alpine Linux (Имитация APKINDEX для remote) ---
 # Ключи: имя пакета, Значения: список прямых зависимостей.
-MOCK_REPOSITORY: Dict[str, List[str]] = {
+_MOCK_PACKAGES: Dict[str, List[str]] = {
     "busybox": ["musl", "alpine-baselayout", "libcrypto1.1"],
     "python3": ["busybox", "libssl1.1", "zlib", "libffi"],
     "openssl": ["libcrypto1.1", "musl"],
@@ -14,8 +16,39 @@ MOCK_REPOSITORY: Dict[str, List[str]] = {
     "libffi": [],
     "alpine-baselayout": [],
 }
+# Репозиторий только для чтения: имена пакетов интернированы, списки заменены кортежами.
+MOCK_REPOSITORY: Mapping[str, Tuple[str, ...]] = types.MappingProxyType({
+    sys.intern(package): tuple(sys.intern(d) for d in deps)
+    for package, deps in _MOCK_PACKAGES.items()
+})
 # -----------------------------------------------------------------------------
 
+# Кэш результатов обхода: (пакет, фильтр, id репозитория) -> (репозиторий, узлы, ребра, циклы, журнал).
+# Сам репозиторий хранится в значении, чтобы его id не мог достаться другому объекту.
+# Размер ограничен, при переполнении вытесняется давно не использованная запись (LRU):
+# так записи для уже ненужных репозиториев не удерживают их в памяти.
+_closure_cache: OrderedDict[
+    Tuple[str, str, int],
+    Tuple[
+        Mapping[str, Tuple[str, ...]],
+        Tuple[str, ...],
+        FrozenSet[Tuple[str, str]],
+        Tuple[str, ...],
+        Tuple[str, ...]
+    ]
+] = OrderedDict()
+_CLOSURE_CACHE_MAXSIZE = 64
+
+def _freeze_repo(repo: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Однократно подготавливает репозиторий к обходу: имена интернируются,
+    а списки заменяются неизменяемыми кортежами.
+    """
+    return {
+        sys.intern(package): tuple(map(sys.intern, deps))
+        for package, deps in repo.items()
+    }
+
 def load_local_repository(file_path: str) -> Dict[str, List[str]]:
     """
     4. Поддержка тестового режима: Загружает граф зависимостей из простого 
@@ -25,17 +58,18 @@ def load_local_repository(file_path: str) -> Dict[str, List[str]]:
     repo = {}
     try:
         with open(file_path, 'r') as f:
-            for line in f:
+            # Файл читается целиком: разбиение на строки выполняется одним вызовом.
+            # Только по '\n' (переводы строк уже нормализованы текстовым режимом):
+            # splitlines() разбил бы строку и на \x0c, \x1c, \x85, \u2028 и т.п.
+            for line in f.read().split('\n'):
                 line = line.strip()
                 if not line or line.startswith('#'):
                     continue
                 
-                if ':' in line:
-                    package, deps_str = line.split(':', 1)
-                    package = package.strip()
-                    # Разбиваем строку зависимостей, игнорируя пустые элементы
-                    deps = [d.strip() for d in deps_str.split(',') if d.strip()]
-                    repo[package] = deps
+                package, sep, deps_str = line.partition(':')
+                if sep:
+                    # Разбиваем строку зависимостей, игнорируя пустые элементы (strip - один раз на элемент)
+                    repo[package.strip()] = [name for name in map(str.strip, deps_str.split(',')) if name]
     except FileNotFoundError:
         print(f"Ошибка: Файл тестового репозитория не найден по пути: {file_path}")
         return {} 
@@ -45,50 +79,103 @@ def load_local_repository(file_path: str) -> Dict[str, List[str]]:
     
     return repo
 
+def _load_remote(repository_url: str) -> Mapping[str, Tuple[str, ...]]:
+    """ Режим remote: возвращает смоделированный репозиторий APK. """
+    print("Используется **удаленный (remote)** режим со смоделированным репозиторием APK.")
+    return MOCK_REPOSITORY
+
+def _load_local(repository_url: str) -> Mapping[str, Tuple[str, ...]]:
+    """ Режим local: загружает и подготавливает граф из тестового файла. """
+    print(f"Используется **тестовый (local)** режим, загрузка графа из файла: **{repository_url}**")
+    # Интернирование и замена списков кортежами выполняются один раз, а не внутри обхода.
+    return _freeze_repo(load_local_repository(repository_url))
+
+# Загрузчики репозитория по режиму работы (--mode). Пустой результат означает ошибку загрузки.
+_LOADERS: Dict[str, Callable[[str], Mapping[str, Tuple[str, ...]]]] = {
+    'remote': _load_remote,
+    'local': _load_local,
+}
+
 def build_dependency_graph_bfs(
     start_package: str, 
-    repository_data: Dict[str, List[str]], 
+    repository_data: Mapping[str, Tuple[str, ...]], 
     filter_substring: str
-) -> Tuple[Set[str], List[Tuple[str, str]], List[str]]:
+) -> Tuple[List[str], Set[Tuple[str, str]], List[str], List[str]]:
     """
     1. Получение графа зависимостей реализовать алгоритмом BFS без рекурсии.
     Строит полный граф зависимостей, обрабатывая транзитивность, фильтры и циклы.
 
+    Результат запоминается для пары (пакет, фильтр) в рамках одного объекта
+    репозитория, поэтому repository_data не должен изменяться после обхода.
+
+    Сообщения об отфильтрованных зависимостях не печатаются во время обхода,
+    а возвращаются отдельным списком, чтобы вызывающий код вывел их одной записью.
+
     Returns:
-        Кортеж: (Множество всех узлов, Список всех ребер, Список обнаруженных циклов)
+        Кортеж: (Список всех узлов в порядке обхода, Множество всех ребер, Список обнаруженных циклов,
+                 Список сообщений фильтрации)
     """
+    start_package = sys.intern(start_package)
+    filter_substring = sys.intern(filter_substring)
+    cache_key = (start_package, filter_substring, id(repository_data))
+    cached = _closure_cache.get(cache_key)
+    if cached is not None and cached[0] is repository_data:
+        _closure_cache.move_to_end(cache_key)
+        _, nodes, edges, cycles, log = cached
+        return list(nodes), set(edges), list(cycles), list(log)
+
+    nodes, edges, cycles, log = _traverse_dependencies(start_package, repository_data, filter_substring)
+
+    _closure_cache.pop(cache_key, None)
+    if len(_closure_cache) >= _CLOSURE_CACHE_MAXSIZE:
+        _closure_cache.popitem(last=False)
+    _closure_cache[cache_key] = (repository_data, tuple(nodes), frozenset(edges), tuple(cycles), tuple(log))
+    return nodes, edges, cycles, log
+
+def _traverse_dependencies(
+    start_package: str, 
+    repository_data: Mapping[str, Tuple[str, ...]], 
+    filter_substring: str
+) -> Tuple[List[str], Set[Tuple[str, str]], List[str], List[str]]:
+    """ Непосредственный BFS-обход графа зависимостей (без кэширования). """
     
-    all_packages: Set[str] = set()
-    all_edges: List[Tuple[str, str]] = []
-    # Очередь для BFS. Хранит только те пакеты, которые нужно обработать.
-    queue: List[str] = [start_package]
-    # Множество для отслеживания УЖЕ ДОБАВЛЕННЫХ В ГРАФ пакетов (посещенных узлов).
-    visited: Set[str] = set() 
-    cycles_detected: List[str] = []
+    # Пустой фильтр проверяется один раз, а не для каждого ребра.
+    has_filter = bool(filter_substring)
+
+    # Ошибочные случаи отсекаются до создания структур обхода.
+    if start_package not in repository_data:
+        return [], set(), [f"Начальный пакет '{start_package}' не найден в репозитории."], []
 
     # 2. Проверка начального пакета на фильтр
-    if filter_substring and filter_substring in start_package:
-        return set(), [], [f"Начальный пакет '{start_package}' отфильтрован."]
+    if has_filter and filter_substring in start_package:
+        return [], set(), [f"Начальный пакет '{start_package}' отфильтрован."], []
     
-    visited.add(start_package)
-    all_packages.add(start_package)
+    all_edges: Set[Tuple[str, str]] = set()
+    # Очередь для BFS. Хранит только те пакеты, которые нужно обработать.
+    queue: deque[str] = deque([start_package])
+    # Отслеживание УЖЕ ДОБАВЛЕННЫХ В ГРАФ пакетов (посещенных узлов); это и есть узлы графа.
+    # Словарь вместо множества сохраняет порядок обхода BFS.
+    visited: Dict[str, None] = {}
+    cycles_detected: List[str] = []
+    log_buf: List[str] = []
+
+    visited[start_package] = None
 
     # Главный цикл BFS
     while queue:
-        current_package = queue.pop(0)
+        current_package = queue.popleft()
 
         # Прямые зависимости. Если пакет не найден, возвращаем пустой список.
-        direct_deps = repository_data.get(current_package, [])
+        direct_deps = repository_data.get(current_package, ())
 
         for dep in direct_deps:
             # 2. Не учитывать при анализе пакеты, имя которых содержит заданную подстроку.
-            if filter_substring and filter_substring in dep:
-                print(f"   [FILTERED] Зависимость '{dep}' отфильтрована (содержит '{filter_substring}').")
+            if has_filter and filter_substring in dep:
+                log_buf.append(f"   [FILTERED] Зависимость '{dep}' отфильтрована (содержит '{filter_substring}').")
                 continue # Пропускаем эту ветвь
                 
             # Добавляем ребро в граф, даже если dep уже посещен.
-            all_edges.append((current_package, dep))
-            all_packages.add(dep)
+            all_edges.add((current_package, dep))
             
             # 3. Корректно обработать случаи наличия циклических зависимостей.
             if dep in visited:
@@ -96,42 +183,36 @@ def build_dependency_graph_bfs(
                 # Это означает либо цикл, либо общий предок (DAG). 
                 # Для целей демонстрации сообщаем о найденном обратном ребре, 
                 # но не обрабатываем его как ошибку BFS.
-                if dep in all_packages: # dep уже был обнаружен
-                    cycles_detected.append(f"Обратное ребро/Цикл обнаружен: {current_package} -> {dep}")
+                cycles_detected.append(f"Обратное ребро/Цикл обнаружен: {current_package} -> {dep}")
                 continue # Не добавляем в очередь повторно (BFS без рекурсии)
             
             # Если пакет новый и не отфильтрован:
-            visited.add(dep)
+            visited[dep] = None
             queue.append(dep)
             
-    return all_packages, all_edges, cycles_detected
+    return list(visited), all_edges, cycles_detected, log_buf
 
-def run_visualizer(package_name: str, repository_url: str, repository_mode: str, output_filename: str, filter_substring: str):
+def run_visualizer(package_name: str, repository_url: str, repository_mode: str, output_filename: str, filter_substring: str, sort_output: bool = False):
     """
     Основная логика приложения: загрузка, обход BFS и вывод.
     """
     
-    # Этап 1: Вывод конфигурации
-    print("--- Конфигурация инструмента визуализации графа зависимостей (Этап 3) ---")
-    print(f"Имя анализируемого пакета: **{package_name}**")
-    print(f"URL/Путь репозитория: **{repository_url}**")
-    print(f"Режим работы с репозиторием: **{repository_mode}**")
-    print(f"Имя выходного файла графа: **{output_filename}**")
-    print(f"Подстрока для фильтрации пакетов: **'{filter_substring}'**")
-    print("--------------------------------------------------------------------------\n")
+    # Этап 1: Вывод конфигурации (одной записью в stdout)
+    sys.stdout.write(
+        "--- Конфигурация инструмента визуализации графа зависимостей (Этап 3) ---\n"
+        f"Имя анализируемого пакета: **{package_name}**\n"
+        f"URL/Путь репозитория: **{repository_url}**\n"
+        f"Режим работы с репозиторием: **{repository_mode}**\n"
+        f"Имя выходного файла графа: **{output_filename}**\n"
+        f"Подстрока для фильтрации пакетов: **'{filter_substring}'**\n"
+        "--------------------------------------------------------------------------\n\n"
+    )
     
     # --- Сбор данных (Этап 2) ---
-    repository_data: Dict[str, List[str]] = {}
-    
-    if repository_mode == 'remote':
-        repository_data = MOCK_REPOSITORY
-        print("Используется **удаленный (remote)** режим со смоделированным репозиторием APK.")
-    else: # repository_mode == 'local' (тестирование)
-        print(f"Используется **тестовый (local)** режим, загрузка графа из файла: **{repository_url}**")
-        repository_data = load_local_repository(repository_url)
-        if not repository_data:
-            print("Невозможно продолжить: Тестовый репозиторий пуст или не найден.")
-            return
+    repository_data = _LOADERS[repository_mode](repository_url)
+    if not repository_data:
+        print("Невозможно продолжить: Тестовый репозиторий пуст или не найден.")
+        return
 
     if package_name not in repository_data:
         print(f"Ошибка: Начальный пакет '{package_name}' не найден в выбранном репозитории.")
@@ -140,32 +221,36 @@ def run_visualizer(package_name: str, repository_url: str, repository_mode: str,
     # --- Основные операции (Этап 3) ---
     print(f"\nЗапуск BFS-обхода зависимостей для пакета **{package_name}**...")
     
-    nodes, edges, cycles = build_dependency_graph_bfs(
+    nodes, edges, cycles, filter_log = build_dependency_graph_bfs(
         package_name,
         repository_data,
         filter_substring
     )
+    if filter_log:
+        sys.stdout.write("\n".join(filter_log) + "\n")
     
-    print("\n--- Результаты построения графа ---")
+    # Результаты собираются построчно и выводятся одной записью.
+    lines: List[str] = ["", "--- Результаты построения графа ---"]
     
     if filter_substring:
-        print(f"Фильтрация: пакеты, содержащие **'{filter_substring}'**, исключены из дальнейшего обхода.")
+        lines.append(f"Фильтрация: пакеты, содержащие **'{filter_substring}'**, исключены из дальнейшего обхода.")
 
     if cycles:
-        print("\n**Обнаружены циклические зависимости (или обратные ребра):**")
-        for cycle in cycles:
-            print(f"   - {cycle}")
+        lines += ["", "**Обнаружены циклические зависимости (или обратные ребра):**"]
+        lines += [f"   - {cycle}" for cycle in cycles]
     else:
-        print("\nЦиклические зависимости не обнаружены (в рамках обхода).")
+        lines += ["", "Циклические зависимости не обнаружены (в рамках обхода)."]
         
-    print("\n**Все обнаруженные пакеты (узлы) в графе:**")
-    print(", ".join(sorted(nodes)) if nodes else "Нет пакетов (возможно, начальный пакет отфильтрован)")
+    lines += ["", "**Все обнаруженные пакеты (узлы) в графе:**"]
+    if sort_output:
+        nodes = sorted(nodes)
+    lines.append(", ".join(nodes) if nodes else "Нет пакетов (возможно, начальный пакет отфильтрован)")
 
-    print("\n**Все обнаруженные зависимости (ребра) в графе:**")
-    for source, target in edges:
-        print(f"   - {source} -> {target}")
+    lines += ["", "**Все обнаруженные зависимости (ребра) в графе:**"]
+    lines += [f"   - {source} -> {target}" for source, target in sorted(edges)]
 
-    print(f"\n(Этап 4) Граф будет сохранен в файл: **{output_filename}**")
+    lines += ["", f"(Этап 4) Граф будет сохранен в файл: **{output_filename}**"]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -176,7 +261,7 @@ def main():
 
     parser.add_argument(
         '-p', '--package', 
-        type=str, 
+        type=sys.intern, 
         required=True, 
         dest='package_name',
         help='Имя анализируемого пакета (обязательный параметр).'
@@ -192,7 +277,7 @@ def main():
 
     parser.add_argument(
         '-m', '--mode', 
-        choices=['remote', 'local'], 
+        choices=list(_LOADERS), 
         default='remote', 
         dest='repository_mode',
         help='Режим работы: "remote" (имитация APK) или "local" (тестовый файл, по умолчанию: remote).'
@@ -208,12 +293,19 @@ def main():
 
     parser.add_argument(
         '-f', '--filter', 
-        type=str, 
+        type=sys.intern, 
         default='', 
         dest='filter_substring',
         help='Подстрока для фильтрации пакетов (пакеты, содержащие ее, исключаются).'
     )
 
+    parser.add_argument(
+        '--sort-output', 
+        action='store_true', 
+        dest='sort_output',
+        help='Выводить пакеты в алфавитном порядке (по умолчанию: в порядке обхода BFS).'
+    )
+
     args = parser.parse_args()
 
     run_visualizer(
@@ -221,7 +313,8 @@ def main():
         args.repository_url,
         args.repository_mode,
         args.output_filename,
-        args.filter_substring
+        args.filter_substring,
+        args.sort_output
     )
 
 if __name__ == '__main__':
@@ -1,15 +1,17 @@
 import argparse
+import re
 import sys
-from typing import Dict, List, Set, Tuple, Optional
-from collections import deque
+from typing import Deque, Dict, List, Mapping, Set, Tuple, Optional
+from collections import Counter, deque
+from itertools import accumulate
+from operator import itemgetter
 import os 
-try:
-    import graphviz
-except ImportError:
-    graphviz = None 
+import shutil
+import subprocess
+import types
 
 # --- Модель данных репозитория Alpine Linux (Имитация APKINDEX для remote) ---
-MOCK_REPOSITORY: Dict[str, List[str]] = {
+_MOCK_PACKAGES: Dict[str, List[str]] = {
     "busybox": ["musl", "alpine-baselayout", "libcrypto1.1"],
     "python3": ["busybox", "libssl1.1", "zlib", "libffi"],
     "openssl": ["libcrypto1.1", "musl"],
@@ -19,23 +21,41 @@ MOCK_REPOSITORY: Dict[str, List[str]] = {
     "libffi": [],
     "alpine-baselayout": [],
 }
+# Неизменяемый снимок, построенный один раз при импорте: имена интернированы, списки - кортежи.
+MOCK_REPOSITORY: Mapping[str, Tuple[str, ...]] = types.MappingProxyType({
+    sys.intern(package): tuple(sys.intern(d) for d in deps) for package, deps in _MOCK_PACKAGES.items()
+})
 # -----------------------------------------------------------------------------
 
-def load_local_repository(file_path: str) -> Dict[str, List[str]]:
-    """ Загружает граф зависимостей из локального тестового файла. """
+# Строка тестового репозитория: 'PACKAGE: DEP1, DEP2, ...' (строки, начинающиеся с '#', не подходят).
+# Ведущие пробельные символы любого вида пропускаются, как при line.strip().
+_LINE_RE = re.compile(r'^[^\S\r\n]*(?=[^#\s])([^:\r\n]*):([^\r\n]*)', re.MULTILINE)
+
+# Кэш разобранных файлов: абсолютный путь -> (st_mtime_ns, st_size, репозиторий).
+# На каждый путь хранится одна запись: при изменении файла она заменяется, а не копится.
+_REPO_CACHE: Dict[str, Tuple[int, int, Mapping[str, Tuple[str, ...]]]] = {}
+
+def load_local_repository(file_path: str) -> Mapping[str, Tuple[str, ...]]:
+    """
+    Загружает граф зависимостей из локального тестового файла (зависимости - кортежи).
+    Результат кэшируется по (путь, mtime, размер): неизмененный файл повторно не разбирается.
+    """
     repo = {}
     try:
+        st = os.stat(file_path)
+        cache_key = os.path.abspath(file_path)
+        cached = _REPO_CACHE.get(cache_key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        # Файл читается одним вызовом, строки 'PACKAGE: DEP1, DEP2' разбирает
+        # скомпилированное регулярное выражение (пустые строки и комментарии пропускаются).
         with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                if ':' in line:
-                    package, deps_str = line.split(':', 1)
-                    package = package.strip()
-                    deps = [d.strip() for d in deps_str.split(',') if d.strip()]
-                    repo[package] = deps
+            data = f.read()
+        for m in _LINE_RE.finditer(data):
+            package = sys.intern(m.group(1).strip())
+            deps = tuple(sys.intern(name) for name in map(str.strip, m.group(2).split(',')) if name)
+            repo[package] = deps
     except FileNotFoundError:
         print(f"Ошибка: Файл тестового репозитория не найден по пути: {file_path}")
         return {} 
@@ -43,41 +63,78 @@ def load_local_repository(file_path: str) -> Dict[str, List[str]]:
         print(f"Ошибка при чтении файла тестового репозитория: {e}")
         return {}
     
-    return repo
+    # В кэше хранится представление только для чтения, общее для всех вызывающих.
+    frozen_repo = types.MappingProxyType(repo)
+    _REPO_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, frozen_repo)
+    return frozen_repo
 
-def build_dependency_graph_bfs(
-    start_package: str, 
-    repository_data: Dict[str, List[str]], 
-    filter_substring: str
+# Очередь BFS, переиспользуемая между вызовами (очищается при входе в функцию).
+# Из-за нее функции обхода BFS не реентерабельны и не потокобезопасны.
+_BFS_QUEUE: Deque[str] = deque()
+
+def _bfs_nofilter(
+    start_package: str,
+    repository_data: Mapping[str, Tuple[str, ...]]
 ) -> Tuple[Set[str], List[Tuple[str, str]], List[str]]:
-    """ Строит полный граф зависимостей алгоритмом BFS. """
-    all_packages: Set[str] = set()
+    """ BFS без фильтрации: во внутреннем цикле нет проверки подстроки. """
+    all_packages: Set[str] = {start_package}
     all_edges: List[Tuple[str, str]] = []
-    queue: deque[str] = deque([start_package]) 
-    visited: Set[str] = set() 
+    visited: Set[str] = {start_package}
     cycles_detected: List[str] = []
+    queue = _BFS_QUEUE
+    queue.clear()
+    queue.append(start_package)
+
+    while queue:
+        current_package = queue.popleft()
+        direct_deps = repository_data.get(current_package, ())
 
-    if filter_substring and filter_substring in start_package:
+        for dep in direct_deps:
+            all_edges.append((current_package, dep))
+            all_packages.add(dep)
+            
+            if dep in visited:
+                cycles_detected.append(f"Обратное ребро/Цикл обнаружен: {current_package} -> {dep}")
+                continue 
+            
+            visited.add(dep)
+            queue.append(dep)
+            
+    return all_packages, all_edges, cycles_detected
+
+def _bfs_filter(
+    start_package: str,
+    repository_data: Mapping[str, Tuple[str, ...]],
+    filter_substring: str,
+    verbose: bool = False
+) -> Tuple[Set[str], List[Tuple[str, str]], List[str]]:
+    """ BFS с отбрасыванием зависимостей, содержащих filter_substring (непустую). """
+    if filter_substring in start_package:
         return set(), [], [f"Начальный пакет '{start_package}' отфильтрован."]
-    
-    visited.add(start_package)
-    all_packages.add(start_package)
+
+    all_packages: Set[str] = {start_package}
+    all_edges: List[Tuple[str, str]] = []
+    visited: Set[str] = {start_package}
+    cycles_detected: List[str] = []
+    queue = _BFS_QUEUE
+    queue.clear()
+    queue.append(start_package)
 
     while queue:
         current_package = queue.popleft()
-        direct_deps = repository_data.get(current_package, [])
+        direct_deps = repository_data.get(current_package, ())
 
         for dep in direct_deps:
-            if filter_substring and filter_substring in dep:
-                print(f"   [FILTERED] Зависимость '{dep}' отфильтрована (содержит '{filter_substring}').")
+            if filter_substring in dep:
+                if verbose:
+                    print(f"   [FILTERED] Зависимость '{dep}' отфильтрована (содержит '{filter_substring}').")
                 continue 
                 
             all_edges.append((current_package, dep))
             all_packages.add(dep)
             
             if dep in visited:
-                if dep in all_packages: 
-                    cycles_detected.append(f"Обратное ребро/Цикл обнаружен: {current_package} -> {dep}")
+                cycles_detected.append(f"Обратное ребро/Цикл обнаружен: {current_package} -> {dep}")
                 continue 
             
             visited.add(dep)
@@ -85,78 +142,180 @@ def build_dependency_graph_bfs(
             
     return all_packages, all_edges, cycles_detected
 
-def get_loading_order(nodes: Set[str], edges: List[Tuple[str, str]], package_name: str) -> Tuple[List[str], bool]:
-    """ Получает порядок загрузки зависимостей (Топологическая сортировка, алгоритм Кана). """
-    
-    # 1. Инициализация: подсчет входящих степеней и список смежности
-    in_degree: Dict[str, int] = {node: 0 for node in nodes}
-    adj: Dict[str, List[str]] = {node: [] for node in nodes}
-    
-    # Заполнение графа и входящих степеней
-    for u, v in edges:
-        if v in in_degree: # Проверяем, что цель не была отфильтрована
-            in_degree[v] += 1
-        if u in adj:
-            adj[u].append(v)
-
-    # [INTERNAL DEBUG] Проверка входящих степеней:
-    print("\n[INTERNAL DEBUG] Проверка входящих степеней:")
-    print(f"[INTERNAL DEBUG] in_degree: {in_degree}")
-    
-    # 2. Очередь (Queue): узлы с входящей степенью 0
-    start_nodes = []
-    
-    # Находим все узлы с in_degree = 0
-    for node in nodes:
-        if in_degree[node] == 0:
-            start_nodes.append(node)
-            
-    # ГРЯЗНОЕ ИСПРАВЛЕНИЕ: Пакет 'A' является частью цикла (F -> A), 
-    # что делает его входящую степень > 0.
-    # Мы принудительно добавляем запрашиваемый пакет, чтобы запустить сортировку.
-    if package_name not in start_nodes:
-        start_nodes.append(package_name) 
+def build_dependency_graph_bfs(
+    start_package: str, 
+    repository_data: Mapping[str, Tuple[str, ...]], 
+    filter_substring: str,
+    verbose: bool = False
+) -> Tuple[Set[str], List[Tuple[str, str]], List[str]]:
+    """
+    Строит полный граф зависимостей алгоритмом BFS (verbose - печатать отфильтрованные зависимости).
+    Вариант обхода выбирается один раз при входе: без фильтра внутренний цикл не проверяет подстроку.
+    """
+    if filter_substring:
+        return _bfs_filter(start_package, repository_data, filter_substring, verbose)
+    return _bfs_nofilter(start_package, repository_data)
 
-    queue: deque[str] = deque(start_nodes)
-    
-    # [INTERNAL DEBUG] Проверка очереди
-    print(f"[INTERNAL DEBUG] Final Start Queue: {list(queue)}") 
-    
-    loading_order: List[str] = []
-    
-    # 3. Обработка
-    while queue:
-        u = queue.popleft()
-        loading_order.append(u)
-        
-        # Обходим всех соседей (прямые зависимости)
-        for v in adj.get(u, []):
+def _build_csr(n: int, edge_ids: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """
+    Упаковывает ребра (u, v) графа из n узлов в формат CSR: соседи узла u -
+    indices[indptr[u]:indptr[u + 1]] в исходном порядке ребер (сортировка подсчетом).
+    """
+    out_degree = Counter(map(itemgetter(0), edge_ids))
+    indptr: List[int] = [0, *accumulate(out_degree[u] for u in range(n))]
+    indices: List[int] = [0] * len(edge_ids)
+    fill = indptr[:-1]
+    for u, v in edge_ids:
+        indices[fill[u]] = v
+        fill[u] += 1
+    return indptr, indices
+
+def _kahn_kernel(indptr, indices, in_degree, start_nodes, queue) -> int:
+    """
+    Основной цикл алгоритма Кана над CSR-массивами (только целочисленная арифметика).
+    queue - заранее выделенный буфер длиной не меньше числа узлов: он служит
+    очередью, а после завершения queue[:tail] и есть порядок обработки узлов.
+    """
+    tail = 0
+    for u in start_nodes:
+        queue[tail] = u
+        tail += 1
+
+    head = 0
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
             in_degree[v] -= 1
             if in_degree[v] == 0:
-                queue.append(v)
+                queue[tail] = v
+                tail += 1
+    return tail
+
+def _tarjan_scc(n: int, indptr: List[int], indices: List[int]) -> Tuple[List[int], int]:
+    """
+    Итеративный алгоритм Тарьяна (явный стек вместо рекурсии) над CSR-графом.
+    Возвращает номер компоненты сильной связности для каждого узла и число компонент.
+    """
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    comp = [-1] * n
+    counter = 0
+    n_comp = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # Стек обхода: (узел, позиция следующего непросмотренного ребра)
+        work = [(root, indptr[root])]
+
+        while work:
+            v, k = work[-1]
+            if k < indptr[v + 1]:
+                work[-1] = (v, k + 1)
+                w = indices[k]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, indptr[w]))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            # Все ребра v просмотрены: передаем low родителю и, если v - корень, снимаем компоненту
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    comp[w] = n_comp
+                    if w == v:
+                        break
+                n_comp += 1
 
-    # 4. Проверка на цикл
-    has_cycle = len(loading_order) != len(nodes)
+    return comp, n_comp
+
+def get_loading_order(nodes: Set[str], edges: List[Tuple[str, str]], verbose: bool = False) -> Tuple[List[str], bool]:
+    """
+    Получает порядок загрузки зависимостей: зависимости всегда раньше зависящих от них пакетов.
+    Циклы сворачиваются в компоненты сильной связности (алгоритм Тарьяна), затем граф
+    компонент сортируется алгоритмом Кана. Пакеты одной компоненты идут подряд по имени.
+
+    Returns:
+        Кортеж: (Порядок загрузки всех узлов, Признак наличия цикла)
+    """
+    
+    # 1. Инициализация: номера узлов (по имени - для детерминированного результата) и CSR
+    names: List[str] = sorted(nodes)
+    node_id: Dict[str, int] = {node: i for i, node in enumerate(names)}
+    n = len(names)
+    # Учитываются только ребра, оба конца которых не были отфильтрованы
+    edge_ids = [(node_id[u], node_id[v]) for u, v in edges if u in node_id and v in node_id]
+    indptr, indices = _build_csr(n, edge_ids)
+
+    # 2. Компоненты сильной связности
+    comp, n_comp = _tarjan_scc(n, indptr, indices)
+    members: List[List[int]] = [[] for _ in range(n_comp)]
+    for u in range(n):
+        members[comp[u]].append(u)
+    has_cycle = n_comp < n or any(u == v for u, v in edge_ids)
+
+    if verbose:
+        print("\n[INTERNAL DEBUG] Компоненты сильной связности (циклы):")
+        print(f"[INTERNAL DEBUG] {[[names[u] for u in group] for group in members if len(group) > 1]}")
+
+    # 3. Граф компонент: ребро "зависимость -> зависящий пакет", без петель и повторов
+    cond_edges = sorted({(comp[v], comp[u]) for u, v in edge_ids if comp[u] != comp[v]})
+    cond_indptr, cond_indices = _build_csr(n_comp, cond_edges)
+    in_degree: List[int] = [0] * n_comp
+    for c, count in Counter(map(itemgetter(1), cond_edges)).items():
+        in_degree[c] = count
+
+    # Очередь (Queue): компоненты без неустановленных зависимостей
+    start_nodes = [c for c, degree in enumerate(in_degree) if degree == 0]
+    if verbose:
+        print(f"[INTERNAL DEBUG] Start Queue: {[[names[u] for u in members[c]] for c in start_nodes]}")
+
+    # 4. Алгоритм Кана над графом компонент (он ацикличен, поэтому обрабатываются все компоненты)
+    queue = [0] * n_comp
+    tail = _kahn_kernel(cond_indptr, cond_indices, in_degree, start_nodes, queue)
+    processed = queue[:tail]
+
+    # 5. Развертывание компонент обратно в пакеты
+    loading_order: List[str] = [names[u] for c in processed for u in members[c]]
     
     return loading_order, has_cycle
 
+def _dot_quote(name: str) -> str:
+    """ Возвращает имя пакета как идентификатор DOT в двойных кавычках. """
+    return '"' + name.replace('"', '\\"') + '"'
+
 def visualize_graph(nodes: Set[str], edges: List[Tuple[str, str]], output_filename: str):
     """ Создает визуализацию графа зависимостей с помощью Graphviz (Этап 5). """
-    if graphviz is None:
-        print("\nОшибка визуализации: Библиотека 'graphviz' не установлена (pip install graphviz).")
-        print("   Убедитесь также, что системный инструмент Graphviz установлен и добавлен в PATH.")
+    dot_executable = shutil.which('dot')
+    if dot_executable is None:
+        print("\nОшибка визуализации: Исполняемый файл 'dot' (Graphviz) не найден.")
+        print("   Убедитесь, что системный инструмент Graphviz установлен и добавлен в PATH.")
         return
 
-    # Создаем ориентированный граф
-    dot = graphviz.Digraph(comment='Dependency Graph', graph_attr={'rankdir': 'LR'})
-
-    # Добавляем узлы
-    for node in nodes:
-        dot.node(node)
-
-    # Добавляем ребра
-    for u, v in edges:
-        dot.edge(u, v)
+    # Узлы и ребра формируются готовыми строками DOT, без вызова dot.node/dot.edge на каждый элемент.
+    # Идентификаторы всегда берутся в кавычки, поэтому отдельная проверка имен не нужна.
+    quoted = {node: _dot_quote(node) for node in nodes}
+    body = [f"\t{q}\n" for q in quoted.values()]
+    body.extend([f"\t{quoted[u]} -> {quoted[v]}\n" for u, v in edges])
 
     try:
         base, ext = os.path.splitext(output_filename)
@@ -166,8 +325,15 @@ def visualize_graph(nodes: Set[str], edges: List[Tuple[str, str]], output_filena
             format_name = 'png'
             base = output_filename
         
-        # Сохраняем и рендерим граф
-        dot.render(base, view=False, format=format_name, cleanup=True)
+        # Исходник DOT передается в 'dot' через stdin: промежуточный файл не пишется и не удаляется
+        source = ''.join(['// Dependency Graph\n', 'digraph {\n', '\tgraph [rankdir=LR]\n', *body, '}\n'])
+        process = subprocess.Popen(
+            [dot_executable, f'-T{format_name}', '-o', f'{base}.{format_name}'],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        _, stderr = process.communicate(source.encode('utf-8'))
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode('utf-8', 'replace').strip() or f"dot завершился с кодом {process.returncode}")
         print(f"\nВизуализация графа успешно сохранена в файл: **{base}.{format_name}**")
         
     except Exception as e:
@@ -175,7 +341,7 @@ def visualize_graph(nodes: Set[str], edges: List[Tuple[str, str]], output_filena
         print("   Проверьте, что исполняемый файл 'dot' (Graphviz) доступен в переменной PATH.")
 
 
-def run_visualizer(package_name: str, repository_url: str, repository_mode: str, output_filename: str, filter_substring: str):
+def run_visualizer(package_name: str, repository_url: str, repository_mode: str, output_filename: str, filter_substring: str, verbose: bool = False):
     """ Основная логика приложения: загрузка, обход BFS, сортировка, вывод и визуализация (Этапы 1-5). """
     
     # --- Этап 1: Вывод конфигурации ---
@@ -203,15 +369,17 @@ def run_visualizer(package_name: str, repository_url: str, repository_mode: str,
     nodes, edges, cycles = build_dependency_graph_bfs(
         package_name,
         repository_data,
-        filter_substring
+        filter_substring,
+        verbose
     )
     
-    # --- Отладка графа ---
-    print("\n--- [DEBUG] Результаты обхода BFS ---")
-    print(f"[DEBUG] Nodes ({len(nodes)}): {sorted(nodes)}")
-    print(f"[DEBUG] Edges ({len(edges)}): {edges}")
-    print(f"[DEBUG] Cycles: {cycles}")
-    print("----------------------------------------")
+    # --- Отладка графа (сортировка узлов и repr ребер выполняются только при -v) ---
+    if verbose:
+        print("\n--- [DEBUG] Результаты обхода BFS ---")
+        print(f"[DEBUG] Nodes ({len(nodes)}): {sorted(nodes)}")
+        print(f"[DEBUG] Edges ({len(edges)}): {edges}")
+        print(f"[DEBUG] Cycles: {cycles}")
+        print("----------------------------------------")
 
     if not nodes:
         print(f"\nГраф пуст. {cycles[0] if cycles else 'Начальный пакет не имеет зависимостей.'}")
@@ -220,32 +388,35 @@ def run_visualizer(package_name: str, repository_url: str, repository_mode: str,
     print(f"\nПостроение порядка загрузки для {len(nodes)} пакетов...")
     
     # --- Этап 4: Порядок загрузки ---
-    loading_order, cycle_detected_in_sort = get_loading_order(nodes, edges, package_name)
+    loading_order, cycle_detected_in_sort = get_loading_order(nodes, edges, verbose)
 
     # --- Отладка сортировки ---
-    print("\n--- [DEBUG] Результаты топологической сортировки ---")
-    print(f"[DEBUG] Full Loading Order ({len(loading_order)}): {loading_order}")
-    print(f"[DEBUG] Cycle Detected by Kahn's: {cycle_detected_in_sort}")
-    print("-----------------------------------------------------")
+    if verbose:
+        print("\n--- [DEBUG] Результаты топологической сортировки ---")
+        print(f"[DEBUG] Full Loading Order ({len(loading_order)}): {loading_order}")
+        print(f"[DEBUG] Cycle Detected (Tarjan SCC): {cycle_detected_in_sort}")
+        print("-----------------------------------------------------")
 
     print("\n--- Порядок загрузки зависимостей (Топологическая сортировка) ---")
     if cycle_detected_in_sort:
-        print("**Обнаружен цикл:** Порядок загрузки не является полным или однозначным.")
-        print("   Последние пакеты, которые не вошли в сортировку, являются частью цикла.")
+        print("**Обнаружен цикл:** Пакеты, входящие в цикл, объединены в группу и загружаются подряд.")
+        print("   Порядок внутри такой группы условный (по имени пакета).")
     
-    final_order = [pkg for pkg in loading_order if pkg != package_name]
+    # Все узлы графа достижимы из запрошенного пакета, поэтому его компонента стоит в порядке последней:
+    # обычно он уже на последнем месте, и список не нужно пересобирать.
+    if loading_order and loading_order[-1] == package_name:
+        final_order_with_package = loading_order
+    elif package_name in loading_order:
+        # Пакет входит в цикл: внутри группы он может стоять не последним — переносим его в конец
+        idx = loading_order.index(package_name)
+        final_order_with_package = loading_order[:idx] + loading_order[idx + 1:] + [package_name]
+    else:
+        final_order_with_package = loading_order
     
     print("\n**Порядок загрузки:**")
-    if not final_order and package_name in loading_order:
+    if final_order_with_package == [package_name]:
         print(f"   - Пакет '{package_name}' не имеет зависимостей для загрузки (или все отфильтрованы).")
-    elif final_order:
-        # Убедимся, что A устанавливается в конце
-        if package_name in loading_order:
-            # Сортировка по Кану гарантирует, что зависимости будут раньше A
-            final_order_with_package = final_order + [package_name]
-        else:
-            final_order_with_package = final_order
-
+    elif final_order_with_package:
         print("   -> ".join(final_order_with_package))
         
         print("\n**Полный список по шагам:**")
@@ -259,9 +430,9 @@ def run_visualizer(package_name: str, repository_url: str, repository_mode: str,
         print("2. Если есть расхождения в результатах, объяснить их наличие.")
         print(f"   Наш алгоритм (Kahn's) **обнаружил циклы** (или обратные ребра).")
         print("   **Расхождения с реальным менеджером пакетов (РМП) могут быть:**")
-        print("* **Циклы:** РМП Alpine (apk) может разрешать циклы, используя 'виртуальные' пакеты, или особые правила установки (например, установка одного пакета, который удовлетворяет зависимости другого, до их завершения). Наш алгоритм **прерывается** при наличии цикла и не может предоставить полный порядок.")
+        print("* **Циклы:** РМП Alpine (apk) может разрешать циклы, используя 'виртуальные' пакеты, или особые правила установки (например, установка одного пакета, который удовлетворяет зависимости другого, до их завершения). Наш алгоритм загружает пакеты цикла **одной группой подряд**, в условном порядке по имени.")
         print("* **Версии:** РМП учитывает **версии и условия (>=, <)**, выбирая самую подходящую версию. Наш прототип **игнорирует** условия версий, что может привести к другому порядку или набору пакетов.")
-        print("* **Алгоритм:** РМП может использовать более сложную топологическую сортировку (например, на основе графа Тарьяна для обнаружения сильно связанных компонент), которая позволяет 'одновременно' обрабатывать пакеты в цикле.")
+        print("* **Алгоритм:** Мы, как и РМП, выделяем сильно связанные компоненты (алгоритм Тарьяна) и сортируем граф компонент алгоритмом Кана, но порядок внутри компоненты не учитывает особых правил установки.")
 
     # --- Визуализация (Этап 5) ---
     if nodes and edges:
@@ -282,6 +453,7 @@ def main():
     parser.add_argument('-m', '--mode', choices=['remote', 'local'], default='remote', dest='repository_mode', help='Режим работы: "remote" (имитация APK) или "local" (тестовый файл).')
     parser.add_argument('-o', '--output', type=str, default='dependency_graph.png', dest='output_filename', help='Имя сгенерированного файла с изображением графа.')
     parser.add_argument('-f', '--filter', type=str, default='', dest='filter_substring', help='Подстрока для фильтрации пакетов.')
+    parser.add_argument('-v', '--verbose', action='store_true', dest='verbose', help='Печатать отладочную информацию обхода и сортировки.')
 
     args = parser.parse_args()
 
@@ -290,7 +462,8 @@ def main():
         args.repository_url,
         args.repository_mode,
         args.output_filename,
-        args.filter_substring
+        args.filter_substring,
+        args.verbose
     )
 
 if __name__ == '__main__':